@@ -7,165 +7,314 @@ search_placesツールを呼び出してレストラン情報を取得し、
 ユーザーフレンドリーな日本語形式で出力します。
 """
 
-import asyncio
 import argparse
-import json
+import orjson
 import os
 import sys
 from pathlib import Path
-from mcp import ClientSession, StdioServerParameters
-from mcp.client.stdio import stdio_client
-from dotenv import load_dotenv
+
+# 重いモジュール（mcp, anyio, dotenvなど）はここではimportしません。
+# 引数解析の前にimportすると--helpや引数エラーでも数百msの
+# import時間を払うことになるため、main()まで遅延させています。
+from transport import DEFAULT_SOCKET_PATH
 
 # 現在のスクリプトのディレクトリを取得
 SCRIPT_DIR = Path(__file__).parent
 
-# 環境変数を読み込む（.envファイルから）
-# スクリプトのディレクトリで.envファイルを探す
-env_path = SCRIPT_DIR / ".env"
-load_dotenv(dotenv_path=env_path)
+# 表示対象とする飲食関連のタイプ（O(1)で判定できるようfrozensetで保持）
+_RESTAURANT_TYPES = frozenset({'restaurant', 'food', 'meal_takeaway', 'cafe', 'bakery'})
+
+# スポット1件分の出力テンプレート
+# ループ内で複数のf-stringを組み立てる代わりに、1回のformatで済ませます
+_PLACE_TEMPLATE = (
+    "\n📍 {idx}. {name}\n"
+    "   ⭐ 評価: {rating:.1f} ({user_ratings_total}件のレビュー)\n"
+    "   📍 住所: {address}"
+)
+
+# 地域検索の同時実行数の上限（Google側のQPS制限に配慮）
+MAX_CONCURRENT_SEARCHES = 5
 
 
-async def main():
+def parse_args():
     """
-    メイン関数: MCPサーバーに接続し、グルメ検索を実行します。
+    コマンドライン引数を解析します。
+    サーバーへの接続前に呼び出されるため、--helpでは子プロセスを起動しません。
+    """
+    parser = argparse.ArgumentParser(
+        description="指定された地域のグルメスポットを検索します"
+    )
+    parser.add_argument(
+        "location",
+        nargs="*",
+        default=["茅ヶ崎市"],
+        help=(
+            "検索する地域名（例: 茅ヶ崎市, 藤沢市, 平塚市, 寒川町, 新宿区）。"
+            "複数指定すると並行して検索します"
+        )
+    )
+    parser.add_argument(
+        "-q", "--query",
+        default="ランチ",
+        help="検索クエリ（例: ランチ, ディナー, カフェ）"
+    )
+    parser.add_argument(
+        "-r", "--min-rating",
+        type=float,
+        default=4.0,
+        help="最小評価（デフォルト: 4.0）"
+    )
+    parser.add_argument(
+        "--socket",
+        action="store_true",
+        help=(
+            "Unixドメインソケット経由で常駐サーバーに接続する"
+            f"（デフォルトパス: {DEFAULT_SOCKET_PATH}）。"
+            "指定しない場合はサーバーを子プロセスとして起動します"
+        )
+    )
+    parser.add_argument(
+        "--socket-path",
+        default=None,
+        metavar="PATH",
+        help="常駐サーバーのソケットパスを明示的に指定する（--socketを含意）"
+    )
+
+    return parser.parse_args()
+
+
+def _render_result(data):
+    """
+    1地域分の検索結果をユーザーフレンドリーな形式で表示します。
+
+    Args:
+        data: search_placesツールの応答（パース済みの辞書）
+    """
+    location_name = data.get('location', '指定地域')
+    print(f"✅ 検索完了: {location_name}で{data['count']}件のスポットが見つかりました")
+    print()
+    print("-" * 60)
+
+    places = data.get("places", [])
+    if not places:
+        print("😔 条件に一致するスポットが見つかりませんでした。")
+        print("検索条件を変更してお試しください。")
+    else:
+        # 各スポットの情報を1つのバッファに組み立ててから一度に書き出します
+        # printをスポットごとに繰り返すより書き込み回数が大幅に減ります
+        lines = []
+        for idx, place in enumerate(places, 1):
+            lines.append(_PLACE_TEMPLATE.format(
+                idx=idx,
+                name=place.get('name', '不明'),
+                rating=place.get('rating', 0),
+                user_ratings_total=place.get('user_ratings_total', 0),
+                address=place.get('address', '住所不明'),
+            ))
+
+            # タイプ情報がある場合、主要なタイプを表示
+            types = place.get('types', [])
+            if types:
+                # 日本語で読みやすいタイプを抽出
+                restaurant_types = [
+                    t for t in types
+                    if t in _RESTAURANT_TYPES
+                ]
+                if restaurant_types:
+                    lines.append(f"   🍽️  タイプ: {', '.join(restaurant_types)}")
+
+            lines.append("")
+
+        sys.stdout.write("\n".join(lines) + "\n")
+
+    print("-" * 60)
+    print()
+
+
+async def run_search(session, args):
+    """
+    接続済みのセッションでグルメ検索を実行し、結果を表示します。
+    複数の地域が指定された場合は並行して検索します。
+
+    Args:
+        session: 接続済みのClientSession
+        args: 解析済みのコマンドライン引数
+    """
+    import asyncio
+
+    # サーバーを初期化
+    # この呼び出しで、サーバーとクライアント間のプロトコルハンドシェイクが行われます
+    await session.initialize()
+
+    print("=" * 60)
+    print("グルメ検索エージェント")
+    print("=" * 60)
+    print()
+
+    locations = args.location
+    query = args.query
+    min_rating = args.min_rating
+
+    print(f"📍 地域: {', '.join(locations)}")
+    print(f"🔍 検索クエリ: {query}")
+    print(f"⭐ 最小評価: {min_rating}以上")
+    print()
+
+    try:
+        # 地域ごとのsearch_places呼び出しをスライディングウィンドウで並行実行します
+        # セマフォで同時実行数を制限しつつ、1件完了するごとに次のタスクが
+        # 即座に開始されます（バッチ全体の完了を待ってから次を始めない）
+        sem = asyncio.Semaphore(MAX_CONCURRENT_SEARCHES)
+
+        async def search_one(location):
+            async with sem:
+                return await session.call_tool(
+                    "search_places",
+                    arguments={
+                        "location": location,
+                        "query": query,
+                        "min_rating": min_rating,
+                    },
+                )
+
+        results = await asyncio.gather(*[search_one(loc) for loc in locations])
+
+        # 地域ごとに結果を表示（指定された順序を保ちます）
+        for location, result in zip(locations, results):
+            # 結果を解析
+            # MCPの応答は、TextContentオブジェクトのリストとして返されます
+            if not result.content:
+                print(f"❌ {location}: サーバーから結果が返されませんでした。")
+                continue
+
+            # 最初のコンテンツアイテムからテキストを取得して
+            # JSON文字列をパース（orjsonはstdlib jsonより数倍高速）
+            data = orjson.loads(result.content[0].text)
+
+            # エラーチェック
+            if "error" in data:
+                print(f"❌ エラー: {data['error']}")
+                continue
+
+            # 結果をユーザーフレンドリーな形式で表示
+            _render_result(data)
+
+        print("💡 ヒント: より詳細な情報は、Google Mapsで検索してください。")
+
+    except Exception as e:
+        # エラーハンドリング: 接続エラー、ツール呼び出しエラーなど
+        print(f"❌ エラーが発生しました: {str(e)}")
+        print()
+        print("トラブルシューティング:")
+        print("1. .envファイルにMAPS_API_KEYが設定されているか確認してください")
+        print("2. server.pyが正常に起動できるか確認してください")
+        print("3. インターネット接続を確認してください")
+        sys.exit(1)
+
+
+async def _run_via_socket(socket_path, args):
+    """
+    Unixドメインソケット経由で常駐サーバーに接続して検索を実行します。
+    プロセス起動もimportも不要なので、すぐに検索を開始できます。
+
+    Args:
+        socket_path: 常駐サーバーのUnixドメインソケットのパス
+        args: 解析済みのコマンドライン引数
+    """
+    import anyio
+    from mcp import ClientSession
+    from transport import unix_socket_transport
+
+    async with await anyio.connect_unix(socket_path) as stream:
+        async with unix_socket_transport(stream) as (read, write):
+            async with ClientSession(read, write) as session:
+                await run_search(session, args)
+
+
+async def _run_via_stdio(args):
     """
+    server.pyを子プロセスとして起動し、stdio経由で検索を実行します。
+
+    Args:
+        args: 解析済みのコマンドライン引数
+    """
+    from mcp import ClientSession, StdioServerParameters
+    from mcp.client.stdio import stdio_client
+    from dotenv import load_dotenv
+
+    # 環境変数を読み込む（.envファイルから）
+    # スクリプトのディレクトリで.envファイルを探す
+    load_dotenv(dotenv_path=SCRIPT_DIR / ".env")
+
     # サーバーの起動パラメータを設定
     # server.pyをPythonで実行するように指定
     # サーバーファイルの絶対パスを使用して、確実に見つけられるようにします
     server_script = SCRIPT_DIR / "server.py"
-    
+
     # 環境変数を現在のプロセスの環境変数から継承（.envファイルから読み込んだものも含む）
     server_params = StdioServerParameters(
         command="python",
         args=[str(server_script)],
         env=os.environ.copy(),  # 環境変数を明示的にコピー
     )
-    
+
     # stdioクライアントを使用してサーバーに接続
     # サーバーは子プロセスとして起動され、標準入出力で通信します
     async with stdio_client(server_params) as (read, write):
         async with ClientSession(read, write) as session:
-            # サーバーを初期化
-            # この呼び出しで、サーバーとクライアント間のプロトコルハンドシェイクが行われます
-            await session.initialize()
-            
-            print("=" * 60)
-            print("グルメ検索エージェント")
-            print("=" * 60)
-            print()
-            
-            # コマンドライン引数を解析
-            parser = argparse.ArgumentParser(
-                description="指定された地域のグルメスポットを検索します"
-            )
-            parser.add_argument(
-                "location",
-                nargs="?",
-                default="茅ヶ崎市",
-                help="検索する地域名（例: 茅ヶ崎市, 藤沢市, 平塚市, 寒川町, 新宿区）"
-            )
-            parser.add_argument(
-                "-q", "--query",
-                default="ランチ",
-                help="検索クエリ（例: ランチ, ディナー, カフェ）"
-            )
-            parser.add_argument(
-                "-r", "--min-rating",
-                type=float,
-                default=4.0,
-                help="最小評価（デフォルト: 4.0）"
-            )
-            
-            args = parser.parse_args()
-            location = args.location
-            query = args.query
-            min_rating = args.min_rating
-            
-            print(f"📍 地域: {location}")
-            print(f"🔍 検索クエリ: {query}")
-            print(f"⭐ 最小評価: {min_rating}以上")
-            print()
-            
-            try:
-                # search_placesツールを呼び出す
-                # ツール名と引数を指定して、サーバーにリクエストを送信します
-                result = await session.call_tool(
-                    "search_places",
-                    arguments={
-                        "location": location,
-                        "query": query,
-                        "min_rating": min_rating,
-                    },
-                )
-                
-                # 結果を解析
-                # MCPの応答は、TextContentオブジェクトのリストとして返されます
-                if result.content:
-                    # 最初のコンテンツアイテムからテキストを取得
-                    result_text = result.content[0].text
-                    
-                    # JSON文字列をパース
-                    data = json.loads(result_text)
-                    
-                    # エラーチェック
-                    if "error" in data:
-                        print(f"❌ エラー: {data['error']}")
-                        return
-                    
-                    # 結果をユーザーフレンドリーな形式で表示
-                    location_name = data.get('location', '指定地域')
-                    print(f"✅ 検索完了: {location_name}で{data['count']}件のスポットが見つかりました")
-                    print()
-                    print("-" * 60)
-                    
-                    places = data.get("places", [])
-                    if not places:
-                        print("😔 条件に一致するスポットが見つかりませんでした。")
-                        print("検索条件を変更してお試しください。")
-                    else:
-                        # 各スポットの情報を表示
-                        for idx, place in enumerate(places, 1):
-                            name = place.get('name', '不明')
-                            rating = place.get('rating', 0)
-                            user_ratings_total = place.get('user_ratings_total', 0)
-                            address = place.get('address', '住所不明')
-                            
-                            print(f"\n📍 {idx}. {name}")
-                            print(f"   ⭐ 評価: {rating:.1f} ({user_ratings_total}件のレビュー)")
-                            print(f"   📍 住所: {address}")
-                            
-                            # タイプ情報がある場合、主要なタイプを表示
-                            types = place.get('types', [])
-                            if types:
-                                # 日本語で読みやすいタイプを抽出
-                                restaurant_types = [
-                                    t for t in types 
-                                    if t in ['restaurant', 'food', 'meal_takeaway', 'cafe', 'bakery']
-                                ]
-                                if restaurant_types:
-                                    print(f"   🍽️  タイプ: {', '.join(restaurant_types)}")
-                            
-                            print()
-                    
-                    print("-" * 60)
-                    print()
-                    print("💡 ヒント: より詳細な情報は、Google Mapsで検索してください。")
-                    
-                else:
-                    print("❌ サーバーから結果が返されませんでした。")
-                    
-            except Exception as e:
-                # エラーハンドリング: 接続エラー、ツール呼び出しエラーなど
-                print(f"❌ エラーが発生しました: {str(e)}")
-                print()
-                print("トラブルシューティング:")
-                print("1. .envファイルにMAPS_API_KEYが設定されているか確認してください")
-                print("2. server.pyが正常に起動できるか確認してください")
-                print("3. インターネット接続を確認してください")
-                sys.exit(1)
+            await run_search(session, args)
+
+
+async def main(args):
+    """
+    メイン関数: MCPサーバーに接続し、グルメ検索を実行します。
+
+    --socketが指定された場合、またはデフォルトパスに常駐サーバーの
+    ソケットが見つかった場合はUnixドメインソケット経由で接続し、
+    サーバープロセスの起動コストを省きます。
+    それ以外は従来どおりserver.pyを子プロセスとして起動します。
+
+    Args:
+        args: 解析済みのコマンドライン引数
+    """
+    # --socket/--socket-pathが明示された場合はそのソケットを使用します
+    socket_path = args.socket_path
+    if socket_path is None and args.socket:
+        socket_path = DEFAULT_SOCKET_PATH
+
+    # 明示されなくても、常駐サーバーのソケットがあれば自動的に使用します
+    auto_detected = False
+    if socket_path is None and os.path.exists(DEFAULT_SOCKET_PATH):
+        socket_path = DEFAULT_SOCKET_PATH
+        auto_detected = True
+
+    if socket_path:
+        try:
+            await _run_via_socket(socket_path, args)
+            return
+        except OSError:
+            # 明示的にソケット接続を指定された場合はそのままエラーにします
+            if not auto_detected:
+                raise
+            # 自動検出したソケットに接続できない場合（サーバー停止後の
+            # 残骸など）は子プロセス起動にフォールバックします
+
+    await _run_via_stdio(args)
 
 
 if __name__ == "__main__":
+    # 引数解析を接続より先に実行します
+    # --helpや引数エラーの場合、サーバーの起動も重いimportも発生しません
+    args = parse_args()
+
+    # uvloopが利用可能ならイベントループを差し替えます（Linux/macOSのみ）
+    # サーバーとの通信（パイプ/ソケットの読み書き）が高速になります
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+
     # クライアントを実行
-    asyncio.run(main())
+    import asyncio
+    asyncio.run(main(args))
@@ -6,18 +6,24 @@ MCPサーバー: Google Maps Places APIをラップして、
 クライアントは、このサーバーに接続してsearch_placesツールを呼び出すことができます。
 """
 
+import argparse
 import asyncio
-import json
+import functools
+import hashlib
+import math
+import orjson
 import os
+import signal
+import sys
+import time
 from pathlib import Path
 from typing import Any, Sequence
-from dotenv import load_dotenv
-import httpx
 
 # 現在のスクリプトのディレクトリを取得
 SCRIPT_DIR = Path(__file__).parent
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
+from transport import DEFAULT_SOCKET_PATH, unix_socket_transport
 from mcp.types import (
     Resource,
     Tool,
@@ -26,16 +32,102 @@ from mcp.types import (
     EmbeddedResource,
 )
 
-# 環境変数を読み込む（.envファイルから）
-# スクリプトのディレクトリで.envファイルを探す
-env_path = SCRIPT_DIR / ".env"
-load_dotenv(dotenv_path=env_path)
+# Places APIに要求するフィールド
+# クライアントが表示するフィールドだけを要求します
+# （Places APIは要求フィールド数に応じて応答サイズ・課金が増えます）
+FIELD_MASK = "places.displayName,places.rating,places.userRatingCount,places.formattedAddress,places.types"
+
+# Places API応答の永続キャッシュ（ディスク上に保存、初回使用時に開く）
+# 同じ検索クエリの繰り返しではネットワークアクセスを省略して、
+# ディスクから即座に結果を返します
+CACHE_TTL = 6 * 60 * 60  # ディスクキャッシュの有効期間（6時間）
+places_cache = None
+
+# パース済み応答のメモリ内キャッシュ（第1層、初回使用時に作成）
+# 同一プロセス内で同じクエリが繰り返されたとき、ディスク読み込みも
+# JSONの復元もせずに済みます
+MEMORY_CACHE_TTL = 60 * 60  # メモリキャッシュの有効期間（1時間）
+memory_cache = None
 
 # Google Maps APIキー（後で初期化）
 # サーバー起動時ではなく、ツールが呼ばれたときに読み込みます
 # これにより、サーバーが正常に起動できるようになります
 MAPS_API_KEY = None
 
+# 持続的なHTTPクライアント（初回使用時に作成）
+# 呼び出しごとに新しいTCP+TLSハンドシェイクを行わないように、
+# keep-alive接続プールとHTTP/2を有効にして再利用します
+http_client = None
+
+
+def _load_api_key() -> str | None:
+    """
+    Google Maps APIキーを読み込みます（初回のみ）。
+
+    .envの読み込み（dotenvのimportを含む）は起動時ではなく
+    ここまで遅延させて、サーバーの起動時間を短くしています。
+
+    Returns:
+        APIキー文字列。設定されていない場合はNone
+    """
+    global MAPS_API_KEY
+    if MAPS_API_KEY is None:
+        # 環境変数を読み込む（.envファイルから）
+        # スクリプトのディレクトリで.envファイルを探す
+        from dotenv import load_dotenv
+        load_dotenv(dotenv_path=SCRIPT_DIR / ".env")
+        MAPS_API_KEY = os.getenv("MAPS_API_KEY")
+    return MAPS_API_KEY
+
+
+def _get_places_cache():
+    """
+    永続キャッシュを返します（初回呼び出し時に開きます）。
+    diskcacheのimportとキャッシュファイルのオープンを
+    最初の検索まで遅延させます。
+    """
+    global places_cache
+    if places_cache is None:
+        import diskcache
+        places_cache = diskcache.Cache(str(SCRIPT_DIR / ".places_cache"))
+    return places_cache
+
+
+def _get_memory_cache():
+    """
+    メモリ内キャッシュを返します（初回呼び出し時に作成します）。
+    エントリ数の上限とTTLを持つLRUとして動作します。
+    """
+    global memory_cache
+    if memory_cache is None:
+        import cachetools
+        memory_cache = cachetools.TTLCache(maxsize=256, ttl=MEMORY_CACHE_TTL)
+    return memory_cache
+
+
+def _get_http_client():
+    """
+    持続的なHTTPクライアントを返します（初回呼び出し時に作成します）。
+    httpxのimportを最初の検索まで遅延させます。
+    """
+    global http_client
+    if http_client is None:
+        import httpx
+        http_client = httpx.AsyncClient(
+            http2=True,
+            timeout=30.0,
+            limits=httpx.Limits(max_keepalive_connections=10, max_connections=20),
+            # APIキーは不変なので、共通ヘッダーはここで1回だけ構築します
+            # リクエストごとの辞書生成と環境変数の参照が不要になります
+            headers={
+                "Content-Type": "application/json",
+                "X-Goog-Api-Key": _load_api_key(),
+                "X-Goog-FieldMask": FIELD_MASK,
+            },
+        )
+    return http_client
+
+
 # MCPサーバーインスタンスを作成
 # サーバー名は「chigasaki-gourmet-server」とします
 server = Server("chigasaki-gourmet-server")
@@ -78,6 +170,36 @@ async def list_tools() -> list[Tool]:
                 "required": ["location", "query"],
             },
         ),
+        Tool(
+            name="search_places_batch",
+            description=(
+                "複数の検索クエリを一度にまとめて検索します。"
+                "各クエリに対するGoogle Maps Places APIの呼び出しを"
+                "並行して実行するため、クエリ数に関わらず"
+                "最も遅い1件分の時間で全結果が返ります。"
+                "結果はクエリをキーとするJSONとして返します。"
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "location": {
+                        "type": "string",
+                        "description": "検索する地域名（例: '茅ヶ崎市', '藤沢市', '平塚市', '寒川町', '新宿区'）",
+                    },
+                    "queries": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "検索クエリのリスト（例: ['ランチ', 'ディナー', 'カフェ']）",
+                    },
+                    "min_rating": {
+                        "type": "number",
+                        "description": "最小評価（デフォルト: 4.0）",
+                        "default": 4.0,
+                    },
+                },
+                "required": ["location", "queries"],
+            },
+        ),
     ]
 
 
@@ -98,10 +220,148 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> Sequence[TextConten
     """
     if name == "search_places":
         return await handle_search_places(arguments)
+    elif name == "search_places_batch":
+        return await handle_search_places_batch(arguments)
     else:
         raise ValueError(f"未知のツール: {name}")
 
 
+def _text_reply(payload: dict[str, Any]) -> TextContent:
+    """
+    ペイロードからTextContentを作ります。
+
+    JSONエンコードはここでのorjson.dumps→decodeの1回だけです。
+    MCPのフレーマはstrを要求するため完全なバイト列パスは取れませんが、
+    応答パスでjson.dumpsを重ねて呼ぶ二重エンコードを避けます。
+    """
+    return TextContent(type="text", text=orjson.dumps(payload).decode())
+
+
+def _error_reply(error_message: str) -> list[TextContent]:
+    """エラーメッセージを1回だけエンコードしてTextContentのリストを作ります。"""
+    return [_text_reply({"error": error_message})]
+
+
+@functools.lru_cache(maxsize=1024)
+def _build_search_query(location: str, query: str) -> str:
+    """
+    地域名とクエリから検索クエリ文字列を組み立てます。
+
+    クエリに地域名が既に含まれている場合は重複して付けません。
+    同じ(地域名, クエリ)の組み合わせが繰り返されるエージェント利用を想定して、
+    部分文字列の走査と文字列結合をメモ化しています。
+
+    Args:
+        location: 検索する地域名（例: '茅ヶ崎市'）
+        query: 検索クエリ文字列（例: 'ランチ'）
+
+    Returns:
+        Places APIに渡す検索クエリ文字列
+    """
+    if location in query:
+        return query
+    return f"{location} {query}"
+
+
+async def _fetch_places(search_query: str, min_rating: float) -> dict[str, Any]:
+    """
+    Places API (New) Text Searchを実行して、生の応答を返します。
+    キャッシュにヒットした場合はAPIを呼び出さずにキャッシュ済みの結果を返し、
+    ミスした場合はAPIを呼び出して結果をキャッシュに保存します。
+
+    評価のフィルタリングはminRatingパラメータでGoogle側に任せるため、
+    しきい値未満の場所は応答に含まれず、転送・パースするバイト数が減ります。
+
+    Args:
+        search_query: 検索クエリ文字列（地域名を含む、例: '茅ヶ崎市 ランチ'）
+        min_rating: 最小評価（Places APIのminRatingとして送信されます）
+
+    Returns:
+        Places APIの応答（JSON形式の辞書）
+    """
+    # 新しいAPIエンドポイント: https://places.googleapis.com/v1/places:searchText
+    url = "https://places.googleapis.com/v1/places:searchText"
+    payload = {
+        "textQuery": search_query,
+        "languageCode": "ja",
+        "pageSize": 20,
+    }
+    # minRatingは0.5刻みで、端数はGoogle側で「切り上げ」られます
+    # そのまま送ると4.2が4.5として扱われ、4.2〜4.4の場所が失われるため、
+    # 0.5刻みに切り下げた値（APIの許容範囲0.0〜5.0に収めたもの）を送り、
+    # 正確なしきい値は_extract_placesの評価チェックで適用します
+    api_min_rating = min(math.floor(min_rating * 2) / 2, 5.0)
+    if api_min_rating > 0:
+        payload["minRating"] = api_min_rating
+
+    # 応答がしきい値に依存するようになったため、キャッシュキーにも
+    # min_ratingを含めます
+    # 第1層: メモリ内キャッシュを確認
+    memory = _get_memory_cache()
+    memory_key = (search_query, min_rating)
+    cached_result = memory.get(memory_key)
+    if cached_result is not None:
+        return cached_result
+
+    # 第2層: ディスクキャッシュを確認（検索クエリ・言語コード・しきい値がキー）
+    cache = _get_places_cache()
+    cache_key = hashlib.blake2b(f"{search_query}|ja|{min_rating}".encode()).hexdigest()
+    cached = cache.get(cache_key)
+    if cached is not None and time.time() - cached["ts"] < CACHE_TTL:
+        # ディスクキャッシュヒット: APIを呼び出さずにキャッシュ済みの結果を再利用
+        # 次回以降はメモリから返せるように第1層にも載せます
+        memory[memory_key] = cached["json"]
+        return cached["json"]
+
+    # 共通ヘッダー（APIキー・FieldMask）はクライアント側に設定済みです
+    response = await _get_http_client().post(url, json=payload)
+    response.raise_for_status()
+    # orjsonで応答バイト列を直接パース（stdlib jsonより数倍高速）
+    places_result = orjson.loads(response.content)
+
+    # 成功した応答を両方のキャッシュ層に保存
+    cache.set(cache_key, {"ts": time.time(), "json": places_result})
+    memory[memory_key] = places_result
+    return places_result
+
+
+def _extract_places(places_result: dict[str, Any], min_rating: float) -> list[dict[str, Any]]:
+    """
+    Places APIの応答から、評価が指定値以上の場所だけを抽出します。
+
+    フィルタリング自体はminRatingによりGoogle側で行われるため、
+    ここでの評価チェックは念のための防御的なものです。
+
+    Args:
+        places_result: Places APIの応答（JSON形式の辞書）
+        min_rating: 最小評価
+
+    Returns:
+        場所情報（名前・評価・住所など）の辞書のリスト
+    """
+    places = []
+    if "places" in places_result:
+        for place in places_result["places"]:
+            rating = place.get("rating", 0)
+
+            # 評価が最小値以上の場所のみを追加
+            if rating >= min_rating:
+                display_name = place.get("displayName", {})
+                name = display_name.get("text", "不明") if isinstance(display_name, dict) else str(display_name)
+
+                formatted_address = place.get("formattedAddress", "住所不明")
+
+                place_info = {
+                    "name": name,
+                    "rating": rating,
+                    "user_ratings_total": place.get("userRatingCount", 0),
+                    "address": formatted_address,
+                    "types": place.get("types", []),
+                }
+                places.append(place_info)
+    return places
+
+
 async def handle_search_places(arguments: dict[str, Any]) -> Sequence[TextContent]:
     """
     search_placesツールの実際の処理を行う関数。
@@ -118,15 +378,11 @@ async def handle_search_places(arguments: dict[str, Any]) -> Sequence[TextConten
     Returns:
         TextContentのリスト（JSON形式の検索結果を含む）
     """
-    global MAPS_API_KEY
-    
     # Google Maps APIキーを読み込み（初回のみ）
-    if MAPS_API_KEY is None:
-        MAPS_API_KEY = os.getenv("MAPS_API_KEY")
-        if not MAPS_API_KEY:
-            error_message = "MAPS_API_KEY環境変数が設定されていません。.envファイルを確認してください。"
-            return [TextContent(type="text", text=json.dumps({"error": error_message}, ensure_ascii=False))]
-    
+    if not _load_api_key():
+        error_message = "MAPS_API_KEY環境変数が設定されていません。.envファイルを確認してください。"
+        return _error_reply(error_message)
+
     location = arguments.get("location", "")
     query = arguments.get("query", "")
     min_rating = arguments.get("min_rating", 4.0)
@@ -135,78 +391,105 @@ async def handle_search_places(arguments: dict[str, Any]) -> Sequence[TextConten
         raise ValueError("地域名が指定されていません。")
     if not query:
         raise ValueError("検索クエリが指定されていません。")
-    
+
+    # 遅延import（例外ハンドラで参照するため。初回以降は実質無コスト）
+    import httpx
+
     try:
         # Google Maps Places API (New)のテキスト検索を実行
-        # 地域名とクエリを組み合わせて検索します
-        search_query = f"{location} {query}"
-        
-        # Places API (New) Text Searchを実行
-        # 新しいAPIエンドポイント: https://places.googleapis.com/v1/places:searchText
-        url = "https://places.googleapis.com/v1/places:searchText"
-        headers = {
-            "Content-Type": "application/json",
-            "X-Goog-Api-Key": MAPS_API_KEY,
-            "X-Goog-FieldMask": "places.id,places.displayName,places.rating,places.userRatingCount,places.formattedAddress,places.types,places.location"
-        }
-        payload = {
-            "textQuery": search_query,
-            "languageCode": "ja"
-        }
-        
-        async with httpx.AsyncClient() as client:
-            response = await client.post(url, headers=headers, json=payload, timeout=30.0)
-            response.raise_for_status()
-            places_result = response.json()
-        
-        # 結果を処理
-        places = []
-        if "places" in places_result:
-            for place in places_result["places"]:
-                rating = place.get("rating", 0)
-                
-                # 評価が最小値以上の場所のみを追加
-                if rating >= min_rating:
-                    display_name = place.get("displayName", {})
-                    name = display_name.get("text", "不明") if isinstance(display_name, dict) else str(display_name)
-                    
-                    formatted_address = place.get("formattedAddress", "住所不明")
-                    location = place.get("location", {})
-                    
-                    place_info = {
-                        "name": name,
-                        "rating": rating,
-                        "user_ratings_total": place.get("userRatingCount", 0),
-                        "address": formatted_address,
-                        "place_id": place.get("id", ""),
-                        "types": place.get("types", []),
-                        "geometry": {"location": location} if location else {},
-                    }
-                    places.append(place_info)
-        
-        # 結果をJSON文字列としてフォーマット
-        result_json = json.dumps(
+        # 地域名とクエリを組み合わせて検索します（メモ化済み）
+        search_query = _build_search_query(location, query)
+
+        places_result = await _fetch_places(search_query, min_rating)
+        places = _extract_places(places_result, min_rating)
+
+        # 結果を1回のエンコードでTextContentにまとめます
+        return [_text_reply(
             {
                 "location": location,
                 "query": query,
                 "min_rating": min_rating,
                 "count": len(places),
                 "places": places,
-            },
-            ensure_ascii=False,
-            indent=2,
-        )
-        
-        return [TextContent(type="text", text=result_json)]
+            }
+        )]
         
     except httpx.HTTPStatusError as e:
         # HTTPステータスエラーのハンドリング
         error_message = f"API呼び出しエラー (ステータス {e.response.status_code}): {e.response.text}"
-        return [TextContent(type="text", text=json.dumps({"error": error_message}, ensure_ascii=False))]
+        return _error_reply(error_message)
     except Exception as e:
         # エラーハンドリング: APIキーが無効、クォータ超過、ネットワークエラーなど
         error_message = f"検索中にエラーが発生しました: {str(e)}"
-        return [TextContent(type="text", text=json.dumps({"error": error_message}, ensure_ascii=False))]
+        return _error_reply(error_message)
+
+
+async def handle_search_places_batch(arguments: dict[str, Any]) -> Sequence[TextContent]:
+    """
+    search_places_batchツールの実際の処理を行う関数。
+    複数の検索クエリに対するPlaces API呼び出しをasyncio.gatherで
+    並行実行し、結果をクエリごとにまとめて1つのJSONとして返します。
+    N件のクエリが合計ではなく最も遅い1件分の時間で完了します。
+
+    Args:
+        arguments: {
+            "location": 検索する地域名（例: '茅ヶ崎市', '藤沢市'）,
+            "queries": 検索クエリ文字列のリスト（例: ['ランチ', 'カフェ']）,
+            "min_rating": 最小評価（オプション、デフォルト4.0）
+        }
+
+    Returns:
+        TextContentのリスト（クエリをキーとするJSON形式の検索結果を含む）
+    """
+    # Google Maps APIキーを読み込み（初回のみ）
+    if not _load_api_key():
+        error_message = "MAPS_API_KEY環境変数が設定されていません。.envファイルを確認してください。"
+        return _error_reply(error_message)
+
+    location = arguments.get("location", "")
+    queries = arguments.get("queries", [])
+    min_rating = arguments.get("min_rating", 4.0)
+
+    if not location:
+        raise ValueError("地域名が指定されていません。")
+    if not queries:
+        raise ValueError("検索クエリが指定されていません。")
+
+    # 遅延import（エラー分類で参照するため。初回以降は実質無コスト）
+    import httpx
+
+    # 全クエリのAPI呼び出しを並行実行
+    # return_exceptions=Trueにより、1件の失敗が他のクエリの結果を壊しません
+    search_queries = [_build_search_query(location, query) for query in queries]
+    fetch_results = await asyncio.gather(
+        *[_fetch_places(search_query, min_rating) for search_query in search_queries],
+        return_exceptions=True,
+    )
+
+    # クエリごとに結果（またはエラー）をまとめる
+    results: dict[str, Any] = {}
+    for query, places_result in zip(queries, fetch_results):
+        if isinstance(places_result, Exception):
+            if isinstance(places_result, httpx.HTTPStatusError):
+                error_message = (
+                    f"API呼び出しエラー (ステータス {places_result.response.status_code}): "
+                    f"{places_result.response.text}"
+                )
+            else:
+                error_message = f"検索中にエラーが発生しました: {str(places_result)}"
+            results[query] = {"error": error_message}
+        else:
+            places = _extract_places(places_result, min_rating)
+            results[query] = {"count": len(places), "places": places}
+
+    # 結果を1回のエンコードでTextContentにまとめます
+    return [_text_reply(
+        {
+            "location": location,
+            "min_rating": min_rating,
+            "results": results,
+        }
+    )]
 
 
 async def main():
@@ -222,14 +505,181 @@ async def main():
     )
     # stdioサーバーを起動（標準入出力を使用）
     # これにより、クライアントは子プロセスとしてこのサーバーを起動できます
-    async with stdio_server() as (read_stream, write_stream):
-        await server.run(
-            read_stream,
-            write_stream,
-            init_options,
-        )
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await server.run(
+                read_stream,
+                write_stream,
+                init_options,
+            )
+    finally:
+        # サーバー終了時に持続的なHTTPクライアントをクリーンアップ
+        if http_client is not None:
+            await http_client.aclose()
+
+
+async def run_socket_server(socket_path: str):
+    """
+    Unixドメインソケットで待ち受ける常駐サーバーを起動します。
+
+    stdioモードと違い、クライアントの起動ごとにサーバープロセスを
+    spawnする必要がなくなり、インタープリタ起動＋import時間を
+    毎回払わずに済みます。接続ごとに1つのMCPセッションを処理します。
+
+    Args:
+        socket_path: 待ち受けるUnixドメインソケットのパス
+    """
+    # 遅延import: stdioモードではanyioを読み込まずに済ませます
+    import anyio
+
+    init_options = server.create_initialization_options(
+        notification_options=None,
+        experimental_capabilities=None,
+    )
+
+    # 前回の実行で残ったソケットファイルを削除
+    socket_file = Path(socket_path)
+    if socket_file.exists():
+        socket_file.unlink()
+
+    async def handle_connection(stream):
+        # 1つの接続に対して1つのMCPセッションを処理します
+        # 接続単位のエラーでサーバー全体が落ちないよう、握りつぶさずに
+        # stderrへ記録だけして次の接続を受け付けます
+        try:
+            async with unix_socket_transport(stream) as (read_stream, write_stream):
+                await server.run(read_stream, write_stream, init_options)
+        except Exception as e:
+            print(f"接続の処理中にエラーが発生しました: {e!r}", file=sys.stderr)
+        finally:
+            await stream.aclose()
+
+    listener = await anyio.create_unix_listener(str(socket_file))
+    try:
+        async with listener:
+            await listener.serve(handle_connection)
+    finally:
+        # サーバー終了時に持続的なHTTPクライアントをクリーンアップ
+        if http_client is not None:
+            await http_client.aclose()
+
+
+def _pid_file_path(socket_path: str) -> Path:
+    """ソケットパスに対応するPIDファイルのパスを返します。"""
+    return Path(socket_path + ".pid")
+
+
+def start_daemon(socket_path: str):
+    """
+    常駐サーバーをバックグラウンドプロセスとして起動します。
+
+    親プロセスは起動を報告してすぐに戻り、子プロセスが端末から
+    切り離されてソケットサーバーを実行し続けます。
+    クライアント起動のたびにサーバーをspawnするコストがなくなります。
+
+    Args:
+        socket_path: 待ち受けるUnixドメインソケットのパス
+    """
+    pid_file = _pid_file_path(socket_path)
+    if pid_file.exists():
+        print(f"常駐サーバーは既に起動しています (PIDファイル: {pid_file})")
+        print("停止するには: python server.py --stop")
+        return
+
+    pid = os.fork()
+    if pid > 0:
+        # 親プロセス: 起動を報告して戻る
+        print(f"常駐サーバーをバックグラウンドで起動しました (PID: {pid})")
+        print(f"ソケット: {socket_path}")
+        print("停止するには: python server.py --stop")
+        return
+
+    # 子プロセス: セッションリーダーになって端末から切り離します
+    os.setsid()
+    devnull = os.open(os.devnull, os.O_RDWR)
+    os.dup2(devnull, 0)
+    os.dup2(devnull, 1)
+    os.dup2(devnull, 2)
+    os.close(devnull)
+
+    pid_file.write_text(str(os.getpid()))
+    try:
+        asyncio.run(run_socket_server(socket_path))
+    finally:
+        pid_file.unlink(missing_ok=True)
+        Path(socket_path).unlink(missing_ok=True)
+        os._exit(0)
+
+
+def stop_daemon(socket_path: str):
+    """
+    バックグラウンドで動作中の常駐サーバーを停止します。
+    PIDファイルからプロセスIDを読み取ってSIGTERMを送ります。
+
+    Args:
+        socket_path: 常駐サーバーのUnixドメインソケットのパス
+    """
+    pid_file = _pid_file_path(socket_path)
+    if not pid_file.exists():
+        print("常駐サーバーは起動していません。")
+        return
+
+    pid = int(pid_file.read_text())
+    try:
+        os.kill(pid, signal.SIGTERM)
+        print(f"常駐サーバーを停止しました (PID: {pid})")
+    except ProcessLookupError:
+        print("常駐サーバーのプロセスは既に終了していました。")
+
+    # PIDファイルとソケットの残骸を掃除します
+    pid_file.unlink(missing_ok=True)
+    Path(socket_path).unlink(missing_ok=True)
 
 
 if __name__ == "__main__":
+    # コマンドライン引数を解析（デフォルトは従来どおりのstdioモード）
+    parser = argparse.ArgumentParser(description="茅ヶ崎グルメ検索MCPサーバー")
+    parser.add_argument(
+        "--socket",
+        nargs="?",
+        const=DEFAULT_SOCKET_PATH,
+        default=None,
+        metavar="PATH",
+        help=f"Unixドメインソケットで待ち受ける（デフォルトパス: {DEFAULT_SOCKET_PATH}）",
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="常駐サーバーをバックグラウンドで起動する（--socketを含意）",
+    )
+    parser.add_argument(
+        "--stop",
+        action="store_true",
+        help="バックグラウンドで動作中の常駐サーバーを停止する",
+    )
+    args = parser.parse_args()
+
+    # --daemon/--stopはソケットモードを前提とします
+    socket_path = args.socket
+    if socket_path is None and (args.daemon or args.stop):
+        socket_path = DEFAULT_SOCKET_PATH
+
+    if args.stop:
+        stop_daemon(socket_path)
+        sys.exit(0)
+
+    # uvloopが利用可能ならイベントループを差し替えます（Linux/macOSのみ）
+    # stdioパイプの読み書きやTLS送受信などのawait箇所が高速になります
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+
     # サーバーを起動
-    asyncio.run(main())
+    if args.daemon:
+        start_daemon(socket_path)
+    elif socket_path:
+        asyncio.run(run_socket_server(socket_path))
+    else:
+        asyncio.run(main())
@@ -0,0 +1,86 @@
+"""
+Unixドメインソケット用のMCPトランスポート。
+
+stdioトランスポートと同じ改行区切りJSONのフレーミングを使用して、
+Unixドメインソケットのストリームを、MCPのサーバー/クライアントが扱う
+メッセージストリームのペアに変換します。
+
+server.py（--socketモード）とclient.py（--socket指定時）の両方から
+使用されます。パイプ経由のstdioよりメッセージあたりのオーバーヘッドが
+小さく、サーバーを常駐させることでプロセス起動コストも省けます。
+"""
+
+from contextlib import asynccontextmanager
+
+# デフォルトのソケットパス（サーバーとクライアントで共有）
+DEFAULT_SOCKET_PATH = "/tmp/chigasaki-mcp.sock"
+
+
+@asynccontextmanager
+async def unix_socket_transport(stream):
+    """
+    ソケットストリームをMCPメッセージストリームのペアに変換します。
+
+    stdioトランスポートと同様に、受信したバイト列を改行で区切って
+    JSONRPCMessageとしてパースし、送信するメッセージはJSON化して
+    改行を付けて書き込みます。
+
+    Args:
+        stream: 接続済みのUnixドメインソケットストリーム（anyio.abc.ByteStream）
+
+    Yields:
+        (read_stream, write_stream): Server.run() / ClientSessionに
+        そのまま渡せるメッセージストリームのペア
+    """
+    # 遅延import: このモジュールはDEFAULT_SOCKET_PATHの参照だけでも
+    # 使われるため、重いanyio/mcpのimportは実際にトランスポートを
+    # 作るときまで遅らせます
+    import anyio
+    import anyio.lowlevel
+    from anyio.streams.text import TextReceiveStream
+
+    import mcp.types as types
+    from mcp.shared.message import SessionMessage
+
+    read_stream_writer, read_stream = anyio.create_memory_object_stream(0)
+    write_stream, write_stream_reader = anyio.create_memory_object_stream(0)
+
+    async def socket_reader():
+        # ソケットから読んだバイト列を改行区切りでパースして転送
+        try:
+            async with read_stream_writer:
+                buffer = ""
+                async for chunk in TextReceiveStream(stream):
+                    lines = (buffer + chunk).split("\n")
+                    buffer = lines.pop()
+
+                    for line in lines:
+                        try:
+                            message = types.JSONRPCMessage.model_validate_json(line)
+                        except Exception as exc:
+                            await read_stream_writer.send(exc)
+                            continue
+
+                        await read_stream_writer.send(SessionMessage(message))
+        except anyio.ClosedResourceError:
+            await anyio.lowlevel.checkpoint()
+
+    async def socket_writer():
+        # 送信メッセージをJSON化して改行区切りでソケットに書き込み
+        try:
+            async with write_stream_reader:
+                async for session_message in write_stream_reader:
+                    json_str = session_message.message.model_dump_json(
+                        by_alias=True, exclude_none=True
+                    )
+                    await stream.send((json_str + "\n").encode("utf-8"))
+        except anyio.ClosedResourceError:
+            await anyio.lowlevel.checkpoint()
+
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(socket_reader)
+        tg.start_soon(socket_writer)
+        try:
+            yield read_stream, write_stream
+        finally:
+            tg.cancel_scope.cancel()